@@ -18,17 +18,19 @@ def main() -> None:
     # Column in FES file corresponding to the Free Energy
     # NB: the first column is 0
     fes_column_free = args.fes_col - 1
+    # Optional: stacked FES series file, reused between runs
+    fes_cache_file = args.fes_cache
 
     # Name of the file containing the CVs on which to project the FES and the bias
     colvar_file = args.colvar_file
     # List with the columns of the CVs on which to project the FES
     # NB: the first column is 0
-    colvar_rew_columns = [i - 1 for i in args.rewcol]
+    colvar_rew_columns = [i - 1 for i in args.cv_rew_col_num]
     rew_dimension = len(colvar_rew_columns)
     # List with column numbers of your colvar_file containing the bias
     # and any external bias/restraint/walls --> CHECK
     # NB: the first column is 0
-    colvar_bias_columns = [i - 1 for i in args.biascol]
+    colvar_bias_columns = [i - 1 for i in args.cv_bias_col_num]
 
     # Minimum and maximum bounds of the CVs in the input
     # NB: if I don't define -min or -max in the input, I will find their value scanning the COLVAR file
@@ -36,33 +38,49 @@ def main() -> None:
     # s_max = args.max
 
     # Optional: provide ebetac file for loading
-    exp_beta_ct_file = args.ebetac
+    exp_beta_ct_file = args.exp_bct_file
 
     ### OUTPUT ARGUMENTS
     # Output FES filename
     output_file = args.outfile
     # Optional: ebetac file for saving
-    exp_beta_ct_save = args.savelist
+    exp_beta_ct_save = args.exp_bct_out
 
     # Grid size for the reweighted FES
-    if args.bin:
+    if args.bins:
         assert (
-            len(args.bin) == rew_dimension
-        ), f"ERROR: the number of -bin provided ({len(args.bin)}) does not match the dimension of reweighting CVs ({rew_dimension})"
-        grid_shape = args.bin
+            len(args.bins) == rew_dimension
+        ), f"ERROR: the number of -bin provided ({len(args.bins)}) does not match the dimension of reweighting CVs ({rew_dimension})"
+        grid_shape = args.bins
     else:
         grid_shape = [100] * rew_dimension
 
-    cli.verify_inputs(colvar_file, exp_beta_ct_file, num_fes_files, fes_file_prefix)
+    fes_files = cli.verify_inputs(
+        colvar_file, exp_beta_ct_file, num_fes_files, fes_file_prefix, fes_cache_file
+    )
 
     if exp_beta_ct_file:
         exp_beta_ct = list(np.loadtxt(exp_beta_ct_file))
     else:
-        exp_beta_ct = tiwary.calculate_ct(
+        if fes_cache_file:
+            # Build (or reuse) the stacked series, then read it back contiguously.
+            _, fes_series = io.load_fes_series(
+                fes_file_prefix,
+                fes_cache_file,
+                fes_column_free,
+                discovered=fes_files,
+                verbose=verbose,
+            )
+            # Progress was already reported while reading the FES files.
+            ct_verbose = False
+        else:
+            # Stream the FES files one at a time, in constant memory.
+            fes_series = io.iter_fes_series(fes_files[1], fes_column_free)
+            ct_verbose = verbose
+        exp_beta_ct = tiwary.calculate_ct_from_series(
+            fes_series,
             num_fes_files,
-            fes_file_prefix,
-            fes_column_free,
-            verbose,
+            ct_verbose,
             is_well_tempered,
             gamma,
             kT,
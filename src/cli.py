@@ -1,13 +1,15 @@
 import os.path
 import argparse
 
+from . import io
+
 
 d = (
     "======================================================================== \n"
     "  ___            ___ \n"
-    " | _ \_____ __ _| _ \_  _ \n"
+    " | _ \\_____ __ _| _ \\_  _ \n"
     " |   / -_) V  V /  _/ || |     \n"
-    " |_|_\___|\_/\_/|_|  \_, |\n"
+    " |_|_\\___|\\_/\\_/|_|  \\_, |\n"
     "                     |__/ \n"
     "RewPy - Metadynamics Reweighting in Python \n"
     "Tiwary = Time-independent Free Energy Reconstruction \n"
@@ -83,6 +85,13 @@ def add_input_args(parser):
         "--exp-bct-file",
         help="If provided, use precalculated ebetac list, if omitted use FES files",
     )
+    group.add_argument(
+        "--fes-cache",
+        help=(
+            "If provided, store the FES files as one stacked array in this .npy file "
+            "\nand reuse it on later runs while the FES files are unchanged"
+        ),
+    )
 
 
 def add_output_args(parser):
@@ -205,7 +214,9 @@ def setup_global_variables(args):
 
 
 # CHECK IF NECESSARY FILES EXIST BEFORE STARTING
-def verify_inputs(colvar_file, exp_beta_ct_file, num_fes_files, fes_file_prefix):
+def verify_inputs(
+    colvar_file, exp_beta_ct_file, num_fes_files, fes_file_prefix, fes_cache_file=None
+):
     if not os.path.isfile(colvar_file):
         print("ERROR: file %s not found, check your inputs" % colvar_file)
         exit(1)
@@ -214,8 +225,14 @@ def verify_inputs(colvar_file, exp_beta_ct_file, num_fes_files, fes_file_prefix)
             print("ERROR: file %s not found, check your inputs" % exp_beta_ct_file)
             exit(1)
     else:
-        for i in range(num_fes_files):
-            fname = "%s%d.dat" % (fes_file_prefix, i)
-            if not os.path.isfile(fname):
-                print("ERROR: file %s not found, check your inputs" % fname)
-                exit(1)
+        # One directory listing instead of checking every file separately,
+        # returned so the FES files can be loaded without listing again.
+        try:
+            return io.discover_fes_series(
+                fes_file_prefix,
+                num_fes_files,
+                with_mtime=fes_cache_file is not None,
+            )
+        except AssertionError as e:
+            print("ERROR: %s, check your inputs" % e)
+            exit(1)
@@ -1,52 +1,222 @@
+import os
+import re
+import numbers
+import tempfile
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
 
 def find_fes_files(fes_prefix: str) -> list:
-    path = Path(fes_prefix)
-    # Extract the numbers of the fes files present, with the allocated name.
-    fes_numbers = [
-        str(a.stem).split(str(path.name))[-1]
-        for a in path.parent.rglob(str(path.name) + "*")
-    ]
-    # Check that all the fes files found fit the naming convention, and numbers can be parsed as int.
-    assert all(
-        [s.isdigit() for s in fes_numbers]
-    ), "Some FES filenames do not conform to the required numbering of <pref><num>.dat"
-    # Convert the file numbers to integers and extract the max and min number.
-    fes_numbers = np.asarray([int(s) for s in fes_numbers])
-    fes_start: int = fes_numbers.min()
-    fes_end: int = fes_numbers.max()
-    # Generate list of expected paths, with contiunous numbering and correct names.
-    fes_paths = [
-        path.with_name(f"{path.name}{i}.dat") for i in np.arange(fes_start, fes_end + 1)
-    ]
-    # Check that all of the paths exist and can be read.
-    assert all(
-        [p.is_file() for p in fes_paths]
-    ), f"Some FES files are incorrectly named or missing, expected continuous numbering from {fes_paths[0]} to {fes_paths[-1]}"
     # Return correct, ordered, readable list of paths.
+    # NB: files in the directory not named <pref><num>.dat are ignored.
+    _, fes_paths, _ = discover_fes_series(fes_prefix)
     return fes_paths
 
 
-def load_fes(path) -> pd.DataFrame:
-    # Read in the header line of the FES file.
-    with open(path) as f:
-        header = f.readlines()[0].split()
+def _read_fes_fields(f) -> list:
+    # Read in the header line of the FES file from an open handle.
+    header = f.readline().split()
     # Sum_hills FES contain FIELDS line, so simply extract the column names.
-    assert header[0] == "#!", "Header not found in FES file, cannot read column names"
+    assert (
+        header and header[0] == "#!"
+    ), "Header not found in FES file, cannot read column names"
     fields = header[2:]
     # Standardise column naming (dependends sum_hills run with 1 or 2 CVs)
     fields = [f.replace("projection", "free") for f in fields]
     fields = [f.replace("file.free", "free") for f in fields]
-    # If needed... Extract CV names - all column names before the free energy.
-    # cvs = fields[: fields.index("free")]
-    fes = pd.read_csv(path, sep="\s+", names=fields, comment="#")
+    return fields
+
+
+def load_fes(path) -> pd.DataFrame:
+    # Open the file once: parse the header, then hand the rest to pandas.
+    with open(path) as f:
+        fields = _read_fes_fields(f)
+        # If needed... Extract CV names - all column names before the free energy.
+        # cvs = fields[: fields.index("free")]
+        fes = pd.read_csv(f, sep=r"\s+", names=fields, comment="#")
 
     return fes
 
 
+def discover_fes_series(
+    fes_prefix: str, num_fes_files=None, with_mtime: bool = False
+) -> tuple:
+    path = Path(fes_prefix)
+    parent = path.parent
+    # List the directory once (no recursion) and keep the entries matching
+    # <pref><num>.dat, any other files with the same prefix are ignored.
+    # With num_fes_files only <pref>0.dat to <pref>(num_fes_files-1).dat are
+    # considered, later snapshots may be missing or malformed.
+    pattern = re.compile(re.escape(path.name) + r"(\d+)\.dat")
+    found = {}
+    newest_mtime = 0 if with_mtime else None
+    with os.scandir(parent) as entries:
+        for entry in entries:
+            match = pattern.fullmatch(entry.name)
+            if not match:
+                continue
+            num = int(match.group(1))
+            if num_fes_files is not None and num >= num_fes_files:
+                continue
+            # Zero-padded names (e.g. fes1.dat and fes01.dat) would clash.
+            assert (
+                num not in found
+            ), f"Ambiguous FES numbering: both {found.get(num)} and {entry.name} map to snapshot {num}"
+            found[num] = entry.name
+            # Only stat the files when the caller needs to validate a cache.
+            if with_mtime:
+                newest_mtime = max(newest_mtime, entry.stat().st_mtime_ns)
+    assert found, f"No FES files found matching {path.name}<num>.dat in {parent}"
+    # Check for continuous numbering using the listing rather than the filesystem.
+    if num_fes_files is None:
+        fes_numbers = np.arange(min(found), max(found) + 1)
+    else:
+        fes_numbers = np.arange(num_fes_files)
+    missing = [int(i) for i in fes_numbers if i not in found]
+    assert (
+        not missing
+    ), f"Some FES files are missing, expected continuous numbering from {path.name}{fes_numbers[0]}.dat to {path.name}{fes_numbers[-1]}.dat (missing: {missing[:10]})"
+    fes_paths = [parent / found[i] for i in fes_numbers]
+    # Return the snapshot index, the ordered list of paths and, if requested,
+    # the modification time (ns) of the most recently written FES file.
+    return fes_numbers, fes_paths, newest_mtime
+
+
+def iter_fes_series(fes_paths, column="free"):
+    # Yield one FES snapshot (one column, all grid points) at a time.
+    # column is either a field name or a column number (first column = 0).
+    n_points = None
+    for fes_path in fes_paths:
+        # Single pass per file: header and data come from the same handle.
+        with open(fes_path) as f:
+            fields = _read_fes_fields(f)
+            if isinstance(column, numbers.Integral):
+                assert (
+                    0 <= column < len(fields)
+                ), f"Column number {column} out of range in {fes_path}, available (first column = 0): {fields}"
+                name = fields[column]
+            else:
+                name = column
+                assert (
+                    name in fields
+                ), f"Column {name} not found in {fes_path}, available: {fields}"
+            values = pd.read_csv(
+                f, sep=r"\s+", names=fields, usecols=[name], comment="#"
+            )[name].to_numpy(dtype=np.float64)
+        if n_points is None:
+            n_points = len(values)
+        assert (
+            len(values) == n_points
+        ), f"FES file {fes_path} has {len(values)} grid points, expected {n_points}"
+        yield values
+
+
+def _load_series_index(index_file):
+    if not index_file.is_file():
+        return None
+    with np.load(index_file) as index:
+        return {k: index[k] for k in index.files}
+
+
+def load_fes_series(
+    fes_prefix: str,
+    cache_file=None,
+    column="free",
+    overwrite: bool = False,
+    num_fes_files=None,
+    discovered=None,
+    verbose: bool = False,
+) -> tuple:
+    # Stack the FES snapshots into one (snapshots x grid points) array,
+    # backed by a memory map so the series is never held fully in memory.
+    # With a cache_file the series is stored as .npy (snapshot index, column,
+    # grid size and FES modification time in the sidecar <cache>.index.npz)
+    # so re-runs read one contiguous file instead of every snapshot; without
+    # one a temporary file is used. discovered is the result of an earlier
+    # discover_fes_series call (with with_mtime=True if caching), to avoid
+    # listing the directory again.
+    if discovered is None:
+        discovered = discover_fes_series(
+            fes_prefix, num_fes_files, with_mtime=cache_file is not None
+        )
+    fes_numbers, fes_paths, newest_mtime = discovered
+
+    if cache_file is not None:
+        assert (
+            newest_mtime is not None
+        ), "FES modification times are required to validate the cache"
+        cache_file = Path(cache_file)
+        index_file = cache_file.with_suffix(".index.npz")
+        # Reuse the stacked series only if it was built from exactly these
+        # snapshots, for the same column, and no FES file changed since.
+        index = None if overwrite else _load_series_index(index_file)
+        if (
+            index is not None
+            and cache_file.is_file()
+            and np.array_equal(index["fes_numbers"], fes_numbers)
+            and str(index["column"]) == str(column)
+            and int(index["mtime"]) == newest_mtime
+        ):
+            series = np.load(cache_file, mmap_mode="r")
+            if series.shape == (len(fes_numbers), int(index["n_points"])):
+                if verbose:
+                    print("Using cached FES series %s" % cache_file)
+                return fes_numbers, series
+        # Invalidate the old cache before rebuilding, so an interrupted
+        # rebuild can never be paired with a still-matching index.
+        index_file.unlink(missing_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+
+    if verbose:
+        print("Reading FES files...")
+    num = len(fes_paths)
+    series = None
+    try:
+        for i, values in enumerate(iter_fes_series(fes_paths, column)):
+            if verbose and num > 10 and i % (num // 10) == 0:
+                print("%d of %d (%.0f%%) done" % (i, num, (i * 100.0 / num)))
+            # Allocate the stacked array once the grid size is known.
+            if series is None:
+                shape = (num, len(values))
+                if cache_file is None:
+                    series = np.memmap(
+                        tempfile.TemporaryFile(),
+                        dtype=np.float64,
+                        mode="w+",
+                        shape=shape,
+                    )
+                else:
+                    series = np.lib.format.open_memmap(
+                        tmp_file, mode="w+", dtype=np.float64, shape=shape
+                    )
+            series[i] = values
+    except BaseException:
+        if cache_file is not None:
+            del series
+            tmp_file.unlink(missing_ok=True)
+        raise
+
+    if cache_file is not None:
+        n_points = series.shape[1]
+        series.flush()
+        del series
+        os.replace(tmp_file, cache_file)
+        # Write the index last: it is what marks the cache as valid.
+        with open(tmp_file, "wb") as f:
+            np.savez(
+                f,
+                fes_numbers=fes_numbers,
+                column=str(column),
+                n_points=n_points,
+                mtime=newest_mtime,
+            )
+        os.replace(tmp_file, index_file)
+        series = np.load(cache_file, mmap_mode="r")
+
+    return fes_numbers, series
+
+
 # Load colvar
 def load_colvar(path) -> pd.DataFrame:
     with open(path) as f:
@@ -58,7 +228,7 @@ def load_colvar(path) -> pd.DataFrame:
             df
             for df in pd.read_csv(
                 path,
-                sep="\s+",
+                sep=r"\s+",
                 names=fields,
                 skiprows=1,
                 comment="#",
@@ -57,6 +57,34 @@ def calculate_ct(
     return ebetac
 
 
+# FIRST PART (alternative): calculate c(t) from a series of FES snapshots,
+# e.g. io.load_fes_series (snapshots x grid points) or io.iter_fes_series
+def calculate_ct_from_series(
+    fes_series, num_fes_files, verbose, is_well_tempered, gamma, kT
+):
+    if verbose:
+        print("Reading FES files...")
+
+    ebetac = []
+    # Go through the snapshots one row at a time, so that memory-mapped
+    # series are read contiguously and streamed snapshots never accumulate.
+    for i, row in enumerate(fes_series):
+        if verbose and num_fes_files > 10 and i % (num_fes_files // 10) == 0:
+            print(
+                "%d of %d (%.0f%%) done"
+                % (i, num_fes_files, (i * 100.0 / num_fes_files))
+            )
+        exponent = -np.asarray(row, dtype=np.float64) / kT
+        s1 = np.exp(exponent).sum()
+        if is_well_tempered:
+            s2 = np.exp(exponent / gamma).sum()
+        else:
+            s2 = len(row)
+        ebetac.append(s1 / s2)
+
+    return ebetac
+
+
 def calculate_cv_ranges(
     colvar_file, rew_dimension, colvar_rew_columns, verbose
 ):
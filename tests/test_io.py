@@ -0,0 +1,164 @@
+import os
+
+import numpy as np
+import pytest
+
+from src import io
+from src import tiwary
+
+
+def write_fes(tmp_path, num, free, name="fes"):
+    # Minimal 1D sum_hills style FES file: cv, free energy, derivative.
+    cv = np.linspace(0.0, 1.0, len(free))
+    path = tmp_path / f"{name}{num}.dat"
+    with open(path, "w") as f:
+        f.write("#! FIELDS cv file.free der_cv\n")
+        f.write("#! SET min_cv 0\n")
+        for x, y in zip(cv, free):
+            f.write(f"{x:.6f} {y:.6f} {2 * y:.6f}\n")
+    return path
+
+
+def write_series(tmp_path, n_files=4, n_points=5, offset=0.0):
+    for i in range(n_files):
+        write_fes(tmp_path, i, np.arange(n_points) + i + offset)
+    return str(tmp_path / "fes")
+
+
+def bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_discover_detects_gap(tmp_path):
+    for i in (0, 1, 3):
+        write_fes(tmp_path, i, np.zeros(3))
+    with pytest.raises(AssertionError, match="missing"):
+        io.discover_fes_series(str(tmp_path / "fes"))
+
+
+def test_discover_rejects_duplicate_numbers(tmp_path):
+    write_fes(tmp_path, "1", np.zeros(3))
+    write_fes(tmp_path, "01", np.zeros(3))
+    with pytest.raises(AssertionError, match="Ambiguous"):
+        io.discover_fes_series(str(tmp_path / "fes"))
+
+
+def test_discover_ignores_other_files(tmp_path):
+    prefix = write_series(tmp_path, n_files=3)
+    (tmp_path / "fes_series.npy").write_bytes(b"")
+    fes_numbers, fes_paths, mtime = io.discover_fes_series(prefix)
+    assert list(fes_numbers) == [0, 1, 2]
+    assert [p.name for p in fes_paths] == ["fes0.dat", "fes1.dat", "fes2.dat"]
+    # Files are only stat'ed when a cache needs validating.
+    assert mtime is None
+    assert io.discover_fes_series(prefix, with_mtime=True)[2] > 0
+
+
+def test_discover_limited_to_num_fes_files(tmp_path):
+    prefix = write_series(tmp_path, n_files=3)
+    write_fes(tmp_path, 5, np.zeros(3))
+    write_fes(tmp_path, "07", np.zeros(3))
+    write_fes(tmp_path, 7, np.zeros(3))
+    # Gaps and clashes after the requested snapshots are irrelevant.
+    fes_numbers, fes_paths, _ = io.discover_fes_series(prefix, 3)
+    assert list(fes_numbers) == [0, 1, 2]
+    with pytest.raises(AssertionError, match="missing: \\[3, 4\\]"):
+        io.discover_fes_series(prefix, 5)
+
+
+def test_load_series_without_cache(tmp_path):
+    prefix = write_series(tmp_path)
+    fes_numbers, series = io.load_fes_series(prefix)
+    assert list(fes_numbers) == [0, 1, 2, 3]
+    # Backed by a temporary file rather than held in memory.
+    assert isinstance(series, np.memmap)
+    assert series.shape == (4, 5)
+    np.testing.assert_allclose(series[2], np.arange(5) + 2)
+    _, first = io.load_fes_series(prefix, num_fes_files=2)
+    np.testing.assert_allclose(first, series[:2])
+
+
+def test_iter_series_columns(tmp_path):
+    prefix = write_series(tmp_path)
+    _, fes_paths, _ = io.discover_fes_series(prefix)
+    by_name = list(io.iter_fes_series(fes_paths, "free"))
+    # Column numbers (first column = 0), also as numpy integers.
+    for column in (1, np.int64(1)):
+        np.testing.assert_allclose(list(io.iter_fes_series(fes_paths, column)), by_name)
+    with pytest.raises(AssertionError, match="out of range"):
+        next(io.iter_fes_series(fes_paths, 7))
+    with pytest.raises(AssertionError, match="not found"):
+        next(io.iter_fes_series(fes_paths, "der_x"))
+
+
+def test_cache_is_built_and_reused(tmp_path, monkeypatch):
+    prefix = write_series(tmp_path)
+    cache = tmp_path / "cache" / "series.npy"
+    cache.parent.mkdir()
+    _, built = io.load_fes_series(prefix, cache)
+    assert isinstance(built, np.memmap)
+    assert cache.with_suffix(".index.npz").is_file()
+
+    # A reused cache must not open any FES file.
+    def fail(f):
+        raise AssertionError("FES file read despite valid cache")
+
+    monkeypatch.setattr(io, "_read_fes_fields", fail)
+    _, reused = io.load_fes_series(prefix, cache)
+    assert isinstance(reused, np.memmap)
+    np.testing.assert_allclose(reused, built)
+
+
+def test_cache_invalidated_by_column(tmp_path):
+    prefix = write_series(tmp_path)
+    cache = tmp_path / "series.npy"
+    _, free = io.load_fes_series(prefix, cache)
+    _, der = io.load_fes_series(prefix, cache, column="der_cv")
+    np.testing.assert_allclose(der, 2 * np.asarray(free))
+
+
+def test_cache_invalidated_by_newer_fes(tmp_path):
+    prefix = write_series(tmp_path)
+    cache = tmp_path / "series.npy"
+    io.load_fes_series(prefix, cache)
+    path = write_fes(tmp_path, 1, np.full(5, 7.0))
+    bump_mtime(path)
+    _, series = io.load_fes_series(prefix, cache)
+    np.testing.assert_allclose(series[1], 7.0)
+
+
+def test_failed_rebuild_is_not_reused(tmp_path):
+    prefix = write_series(tmp_path)
+    cache = tmp_path / "series.npy"
+    io.load_fes_series(prefix, cache)
+    # Regenerate the series with one inconsistent snapshot.
+    write_series(tmp_path, offset=10.0)
+    bad = write_fes(tmp_path, 2, np.zeros(3))
+    bump_mtime(bad)
+    with pytest.raises(AssertionError, match="grid points"):
+        io.load_fes_series(prefix, cache)
+    assert not cache.with_suffix(".index.npz").exists()
+    assert not (tmp_path / "series.npy.tmp").exists()
+    # Once fixed, the series is rebuilt rather than served from the old cache.
+    write_fes(tmp_path, 2, np.arange(5) + 12.0)
+    _, series = io.load_fes_series(prefix, cache)
+    np.testing.assert_allclose(series[2], np.arange(5) + 12.0)
+    np.testing.assert_allclose(series[0], np.arange(5) + 10.0)
+
+
+@pytest.mark.parametrize("is_well_tempered, gamma", [(True, 10.0), (False, None)])
+def test_ct_from_series_matches_ct(tmp_path, is_well_tempered, gamma):
+    prefix = write_series(tmp_path)
+    kT = 2.49
+    expected = tiwary.calculate_ct(4, prefix, 1, False, is_well_tempered, gamma, kT)
+    _, series = io.load_fes_series(prefix, tmp_path / "series.npy", column=1)
+    result = tiwary.calculate_ct_from_series(
+        series, 4, False, is_well_tempered, gamma, kT
+    )
+    np.testing.assert_allclose(result, expected)
+    _, fes_paths, _ = io.discover_fes_series(prefix)
+    streamed = tiwary.calculate_ct_from_series(
+        io.iter_fes_series(fes_paths, 1), 4, False, is_well_tempered, gamma, kT
+    )
+    np.testing.assert_allclose(streamed, expected)